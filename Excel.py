@@ -1,15 +1,80 @@
-from flask import Flask, render_template_string, request, jsonify, send_file
+from flask import Flask, Response, request, jsonify, send_file, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import column, event, inspect, table
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateIndex
 from datetime import datetime, date
+from calendar import monthrange
 import pandas as pd
-import io
+import xlsxwriter
+import base64
+import hashlib
+import os
+import random
+import sqlite3
+import tempfile
+import re
+import unicodedata
+from functools import lru_cache
+
+try:
+    import orjson
+except ImportError:  # optional speed-up; Flask's stdlib JSON provider is used without it
+    orjson = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    # Serializes with orjson and hands its bytes straight to the response without re-encoding
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=orjson.OPT_NAIVE_UTC).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=orjson.OPT_NAIVE_UTC)
+        return self._app.response_class(body, mimetype=self.mimetype)
 
 app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///face_attendance.db'
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+# Set DATABASE_URL (e.g. postgresql://...) in production; SQLite is the local default
+DATABASE_URL = os.environ.get('DATABASE_URL', 'sqlite:///face_attendance.db')
+app.config['SQLALCHEMY_DATABASE_URI'] = DATABASE_URL
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': 6,
+    'max_overflow': 20,
+    'pool_pre_ping': True,
+}
+if DATABASE_URL.startswith('sqlite'):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS']['connect_args'] = {'check_same_thread': False}
 db = SQLAlchemy(app)
 
+@event.listens_for(Engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    # WAL lets readers run alongside a writer; NORMAL sync is safe in WAL mode.
+    # foreign_keys is needed for face images to be removed along with their user.
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-64000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
 ADMIN_PIN = "726337"
+BULK_INSERT_BATCH_SIZE = 1000
+STREAM_BATCH_SIZE = 1000
+ADMIN_PAGE_MAX = 500
+USERS_ETAG_WINDOW = 60  # Seconds an /admin/users ETag may go unchanged by attendance updates
 
 # Database model
 class User(db.Model):
@@ -23,94 +88,258 @@ class User(db.Model):
     leaves_taken = db.Column(db.Integer, default=0)
     last_leave_month = db.Column(db.String(7), nullable=True)  # YYYY-MM
     messages = db.Column(db.Text, nullable=True)
-    face_image = db.Column(db.Text, nullable=True)  # Base64 image data
+    # Stored in its own table so user queries never carry the image bytes
+    face = db.relationship('FaceImage', uselist=False, cascade='all, delete-orphan', passive_deletes=True)
+
+    # Case-insensitive lookups filter on lower(...) and names/emails must be unique ignoring case;
+    # reg_no is already covered by its unique index. PostgreSQL prefix searches use LIKE (see
+    # prefix_filter()), which only text_pattern_ops indexes can serve.
+    __table_args__ = (
+        db.Index('uq_user_email_lower', db.func.lower(email), unique=True),
+        db.Index('uq_user_name_lower', db.func.lower(name), unique=True),
+        db.Index(
+            'ix_user_email_lower_pattern', db.func.lower(email).label('email_lower'),
+            postgresql_ops={'email_lower': 'text_pattern_ops'}
+        ).ddl_if(dialect='postgresql'),
+        db.Index(
+            'ix_user_name_lower_pattern', db.func.lower(name).label('name_lower'),
+            postgresql_ops={'name_lower': 'text_pattern_ops'}
+        ).ddl_if(dialect='postgresql'),
+        db.Index(
+            'ix_user_reg_no_pattern', reg_no, postgresql_ops={'reg_no': 'text_pattern_ops'}
+        ).ddl_if(dialect='postgresql'),
+    )
 
     def age(self):
-        today = date.today()
-        return today.year - self.dob.year - ((today.month, today.day) < (self.dob.month, self.dob.day))
+        return calculate_age(self.dob, date.today())
 
-with app.app_context():
-    db.create_all()
+class FaceImage(db.Model):
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True)
+    image = db.Column(db.LargeBinary, nullable=False)  # Raw image bytes
+
+class RegSequence(db.Model):
+    __tablename__ = 'reg_seq'
+    year_code = db.Column(db.String(20), primary_key=True)  # reg_no prefix, e.g. 2025-XYZ-
+    last = db.Column(db.Integer, nullable=False)  # Highest suffix handed out so far
+
+class ListVersion(db.Model):
+    __tablename__ = 'list_version'
+    name = db.Column(db.String(20), primary_key=True)  # Listing the counter tracks, e.g. users
+    version = db.Column(db.Integer, nullable=False)  # Bumped when users are added or deleted
 
 # Utilities
-def generate_next_reg_no():
+def calculate_age(dob, today):
+    return today.year - dob.year - ((today.month, today.day) < (dob.month, dob.day))
+
+def calculate_ages(dobs, today):
+    # Vectorized calculate_age over a datetime64 Series; month * 100 + day orders like (month, day)
+    birth_years = dobs.dt.year.to_numpy()
+    birth_days = dobs.dt.month.to_numpy() * 100 + dobs.dt.day.to_numpy()
+    return today.year - birth_years - (today.month * 100 + today.day < birth_days)
+
+def generate_reg_nos(count):
     year = datetime.now().year
     code = 'XYZ'
-    users = User.query.filter(User.reg_no.like(f"{year}-{code}-%")).all()
-    max_suffix = 0
-    for u in users:
-        try:
-            suffix = int(u.reg_no.split('-')[2])
-            if suffix > max_suffix:
-                max_suffix = suffix
-        except:
-            continue
-    next_suffix = max_suffix + 1
-    return f"{year}-{code}-{str(next_suffix).zfill(4)}"
+    prefix = f"{year}-{code}-"
+    # Reserve `count` suffixes by bumping the per-year counter; concurrent registrations can't collide
+    last = db.session.execute(
+        db.update(RegSequence)
+        .where(RegSequence.year_code == prefix)
+        .values(last=RegSequence.last + count)
+        .returning(RegSequence.last)
+        .execution_options(synchronize_session=False)
+    ).scalar()
+    if last is None:
+        # First registration this year: seed the counter from reg_nos issued before it existed
+        max_suffix = db.session.execute(
+            db.select(db.func.max(db.cast(db.func.substr(User.reg_no, len(prefix) + 1), db.Integer)))
+            .where(User.reg_no.like(f"{prefix}%"))
+        ).scalar() or 0
+        insert = pg_insert if db.session.get_bind().dialect.name == 'postgresql' else sqlite_insert
+        last = db.session.execute(
+            insert(RegSequence)
+            .values(year_code=prefix, last=max_suffix + count)
+            .on_conflict_do_update(
+                index_elements=[RegSequence.year_code],
+                set_={'last': RegSequence.last + count}
+            )
+            .returning(RegSequence.last)
+        ).scalar()
+    return [f"{prefix}{str(suffix).zfill(4)}" for suffix in range(last - count + 1, last + 1)]
 
-def generate_email(name):
-    if not name:
-        return ''
+def generate_next_reg_no():
+    return generate_reg_nos(1)[0]
+
+_EMAIL_STRIP_RE = re.compile(r'[^a-z\s]')
+
+@lru_cache(maxsize=1024)
+def _normalize_name(name):
     normalized = name.strip().lower()
-    import unicodedata, re
     normalized = unicodedata.normalize('NFD', normalized)
     normalized = normalized.encode('ascii', 'ignore').decode('utf-8')
-    normalized = re.sub(r'[^a-z\s]', '', normalized)
-    parts = normalized.split()
+    normalized = _EMAIL_STRIP_RE.sub('', normalized)
+    return tuple(normalized.split())
+
+def prefix_filter(expr, prefix):
+    # SQLite compares text byte by byte, so a range keeps the match on an ordinary index and
+    # U+10FFFF (the highest code point) bounds everything starting with prefix. PostgreSQL
+    # sorts by locale, where such a range can miss or take in rows, so it uses LIKE instead.
+    if db.engine.dialect.name == 'postgresql':
+        return expr.startswith(prefix, autoescape=True)
+    return db.and_(expr >= prefix, expr < prefix + '\U0010ffff')
+
+def generate_email(name, taken_emails=None, next_free=None):
+    if not name:
+        return ''
+    parts = _normalize_name(name)
     if len(parts) == 0:
         return ''
     if len(parts) == 1:
-        base_email = f"{parts[0]}@company.com"
+        prefix = parts[0]
     else:
-        base_email = f"{parts[0]}.{parts[-1]}@company.com"
-
-    existing_emails = {u.email.lower() for u in User.query.all()}
-    email_candidate = base_email
-    counter = 1
-    while email_candidate.lower() in existing_emails:
-        if len(parts) == 1:
-            email_candidate = f"{parts[0]}{counter}@company.com"
-        else:
-            email_candidate = f"{parts[0]}.{parts[-1]}{counter}@company.com"
-        counter += 1
-    return email_candidate
-
+        prefix = f"{parts[0]}.{parts[-1]}"
+
+    counter = 0
+    if taken_emails is not None:
+        # Caller already holds every used (lowercased) email, e.g. during a bulk import.
+        # next_free remembers where each prefix's search stopped, so a batch of namesakes
+        # doesn't re-probe every suffix it has already handed out.
+        if next_free is not None:
+            counter = next_free.get(prefix, 0)
+        while f"{prefix}{counter or ''}@company.com" in taken_emails:
+            counter += 1
+        if next_free is not None:
+            next_free[prefix] = counter + 1
+    else:
+        # Only fetch the emails sharing this prefix and pick the first free numeric suffix.
+        # prefix_filter() keeps the lookup on an index of lower(email), which ILIKE cannot use.
+        rows = db.session.execute(
+            db.select(User.email).where(prefix_filter(db.func.lower(User.email), prefix))
+        ).scalars().all()
+        suffix_re = re.compile(rf"^{re.escape(prefix)}(\d*)@company\.com$")
+        taken = set()
+        for existing in rows:
+            match = suffix_re.match(existing.lower())
+            if match:
+                taken.add(int(match.group(1)) if match.group(1) else 0)
+        while counter in taken:
+            counter += 1
+    if counter == 0:
+        return f"{prefix}@company.com"
+    return f"{prefix}{counter}@company.com"
+
+def decode_image_data_url(data_url):
+    # Accepts "data:image/png;base64,...." or a bare base64 string
+    header, sep, payload = data_url.partition(',')
+    if not sep:
+        payload = header
+    return base64.b64decode(payload, validate=True)  # binascii.Error is a ValueError
+
+@lru_cache(maxsize=64)
 def get_working_days_in_month(year, month):
-    count = 0
-    from calendar import monthrange
-    days_in_month = monthrange(year, month)[1]
-    for day in range(1, days_in_month + 1):
-        weekday = date(year, month, day).weekday()
-        if weekday < 5:
-            count += 1
-    return count
+    first_weekday, days_in_month = monthrange(year, month)
+    full_weeks, extra_days = divmod(days_in_month, 7)
+    # Each full week has 5 weekdays; the leftover days start on first_weekday (Monday=0)
+    return full_weeks * 5 + sum(1 for i in range(extra_days) if (first_weekday + i) % 7 < 5)
 
 def verify_admin_pin():
     # Look for pin query param or JSON body pin
     pin = request.args.get('pin')
-    if not pin and request.is_json:
+    if not pin and request.is_json and isinstance(request.json, dict):
         pin = request.json.get('pin')
     return pin == ADMIN_PIN
 
+def bump_users_version():
+    # Run inside the transaction of writes that add or remove users. Attendance bumps from
+    # /recognize skip it so they don't all queue on this one row's lock; users_list_etag()
+    # expires on its own instead.
+    db.session.execute(
+        db.update(ListVersion)
+        .where(ListVersion.name == 'users')
+        .values(version=ListVersion.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+
+def users_list_etag():
+    # A primary-key read, so every paged request stays cheap. The time window bounds how long
+    # attendance counts (which don't bump the version) and ages can be served stale.
+    version = db.session.execute(
+        db.select(ListVersion.version).where(ListVersion.name == 'users')
+    ).scalar()
+    window = int(datetime.now().timestamp()) // USERS_ETAG_WINDOW
+    return hashlib.md5(f"{version}:{window}".encode()).hexdigest()
+
+def init_db():
+    # Schema setup and the legacy migration race when several processes run them at once, so
+    # they run once per deployment via `flask init-db` (gunicorn.conf.py does so before forking)
+    db.create_all()
+    # create_all() skips tables that already exist, so add any missing indexes explicitly
+    with db.engine.begin() as conn:
+        for index in User.__table__.indexes:
+            if 'postgresql_ops' in index.dialect_kwargs and conn.dialect.name != 'postgresql':
+                continue  # Pattern-ops indexes only exist for PostgreSQL
+            conn.execute(CreateIndex(index, if_not_exists=True))
+        # bump_users_version() only updates, so the counter row has to exist up front
+        insert = pg_insert if conn.dialect.name == 'postgresql' else sqlite_insert
+        conn.execute(insert(ListVersion).values(name='users', version=0).on_conflict_do_nothing())
+    # Databases created before face images moved to their own table still hold them as base64
+    # data URLs in user.face_image; copy them into face_image and clear the old column
+    if 'face_image' in {c['name'] for c in inspect(db.engine).get_columns('user')}:
+        legacy_user = table('user', column('id'), column('face_image'))
+        with db.engine.begin() as conn:
+            legacy = conn.execute(
+                db.select(legacy_user.c.id, legacy_user.c.face_image).where(legacy_user.c.face_image.is_not(None))
+            ).all()
+            images, migrated = [], []
+            for user_id, data_url in legacy:
+                try:
+                    images.append({'user_id': user_id, 'image': decode_image_data_url(data_url)})
+                except ValueError:
+                    continue  # Leave undecodable data where it is rather than lose it
+                migrated.append(user_id)
+            if images:
+                conn.execute(db.insert(FaceImage), images)
+                conn.execute(
+                    legacy_user.update().where(legacy_user.c.id.in_(migrated)).values(face_image=None)
+                )
+
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create missing tables and indexes and migrate legacy face images."""
+    init_db()
+
 # Routes
 @app.route('/')
 def index():
-    return render_template_string(TEMPLATE_HTML)
+    # The page has no template variables, so serve the pre-encoded body and let clients revalidate
+    response = Response(_INDEX_BODY, mimetype='text/html')
+    response.set_etag(_INDEX_ETAG)
+    response.cache_control.public = True
+    response.cache_control.max_age = 300
+    return response.make_conditional(request)
 
 @app.route('/register', methods=['POST'])
 def register():
-    data = request.json
+    # The page uploads the raw image as multipart/form-data; JSON with a base64 data URL is still accepted
+    if request.mimetype == 'multipart/form-data':
+        data = request.form
+        face_file = request.files.get('face_image')
+        face_bytes = face_file.read() if face_file else b''
+    else:
+        data = request.json
+        face_image = data.get('face_image', '').strip()
+        try:
+            face_bytes = decode_image_data_url(face_image)
+        except ValueError:
+            return jsonify({'error': 'Invalid face image data.'}), 400
     name = data.get('name', '').strip()
     dob_str = data.get('dob', '').strip()
     gender = data.get('gender', '').strip()
-    face_image = data.get('face_image', '').strip()
 
-    if not (name and dob_str and gender and face_image):
+    if not (name and dob_str and gender and face_bytes):
         return jsonify({'error': 'Missing required fields'}), 400
 
-    if User.query.filter(db.func.lower(User.name) == name.lower()).first():
-        return jsonify({'error': f'User with name "{name}" already registered.'}), 400
-
     try:
         dob = datetime.strptime(dob_str, '%Y-%m-%d').date()
     except Exception:
@@ -118,9 +347,6 @@ def register():
 
     email = generate_email(name)
 
-    if User.query.filter(db.func.lower(User.email) == email.lower()).first():
-        return jsonify({'error': f'Email "{email}" already registered.'}), 400
-
     reg_no = generate_next_reg_no()
 
     user = User(
@@ -133,93 +359,254 @@ def register():
         leaves_taken=0,
         last_leave_month=None,
         messages='',
-        face_image=face_image
+        face=FaceImage(image=face_bytes)
     )
     db.session.add(user)
-    db.session.commit()
+    # Duplicates are caught by the unique indexes instead of extra SELECTs up front
+    try:
+        bump_users_version()
+        db.session.commit()
+    except IntegrityError as e:
+        db.session.rollback()
+        violation = str(e.orig)
+        if 'name_lower' in violation:
+            return jsonify({'error': f'User with name "{name}" already registered.'}), 400
+        if 'email' in violation:
+            return jsonify({'error': f'Email "{email}" already registered.'}), 400
+        raise
 
     return jsonify({'success': True, 'reg_no': reg_no, 'email': email, 'name': name})
 
 @app.route('/recognize', methods=['POST'])
 def recognize():
-    import random
     data = request.json
-    users = User.query.all()
-    if not users:
-        return jsonify({'recognized': False, 'message': 'No users registered yet.'})
     if random.random() < 0.5:
-        user = random.choice(users)
-        user.attendance_count += 1
-        db.session.commit()
-        return jsonify({
-            'recognized': True,
-            'reg_no': user.reg_no,
-            'name': user.name,
-            'attendance_count': user.attendance_count,
-            'message': f'Recognized {user.name} ({user.reg_no}). Attendance incremented.'
-        })
-    else:
+        # Pick and increment a random user in one statement instead of loading every user
+        random_id = db.select(User.id).order_by(db.func.random()).limit(1).scalar_subquery()
+        user = db.session.execute(
+            db.update(User)
+            .where(User.id == random_id)
+            .values(attendance_count=User.attendance_count + 1)
+            .returning(User.reg_no, User.name, User.attendance_count)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if user:
+            db.session.commit()
+            return jsonify({
+                'recognized': True,
+                'reg_no': user.reg_no,
+                'name': user.name,
+                'attendance_count': user.attendance_count,
+                'message': f'Recognized {user.name} ({user.reg_no}). Attendance incremented.'
+            })
+    elif db.session.execute(db.select(User.id).limit(1)).first():
         return jsonify({'recognized': False, 'message': 'Face not recognized. Please register.'})
+    return jsonify({'recognized': False, 'message': 'No users registered yet.'})
 
 @app.route('/admin/users', methods=['GET'])
 def admin_users():
     if not verify_admin_pin():
         return jsonify({'error': 'Unauthorized: Invalid PIN'}), 403
-    users = User.query.all()
-    users_list = []
-    for u in users:
-        users_list.append({
-            'reg_no': u.reg_no,
-            'name': u.name,
-            'age': u.age(),
-            'gender': u.gender,
-            'email': u.email,
-            'attendance_count': u.attendance_count
-        })
-    return jsonify(users_list)
+    # Optional paging (?offset=&limit=) and RegNo/name prefix filter (?q=); no limit returns everyone
+    offset = max(request.args.get('offset', 0, type=int), 0)
+    limit = request.args.get('limit', type=int)
+    q = request.args.get('q', '').strip()
+    # Select only the listed columns so face images are never loaded
+    stmt = db.select(
+        User.reg_no, User.name, User.dob, User.gender, User.email, User.attendance_count
+    ).order_by(User.id)
+    if q:
+        # prefix_filter() keeps both matches on the reg_no and lower(name) indexes (ILIKE can't
+        # use them); reg_nos are stored uppercase
+        stmt = stmt.where(db.or_(
+            prefix_filter(User.reg_no, q.upper()),
+            prefix_filter(db.func.lower(User.name), q.lower())
+        ))
+    if offset:
+        stmt = stmt.offset(offset)
+    if limit is not None:
+        stmt = stmt.limit(min(max(limit, 1), ADMIN_PAGE_MAX))
+    stmt = stmt.execution_options(yield_per=STREAM_BATCH_SIZE)
+    today = date.today()
+
+    def generate():
+        # Stream the JSON array one batch of rows at a time instead of building the full list
+        separator = '['
+        for rows in db.session.execute(stmt).partitions():
+            yield separator + ','.join(app.json.dumps({
+                'reg_no': u.reg_no,
+                'name': u.name,
+                'age': calculate_age(u.dob, today),
+                'gender': u.gender,
+                'email': u.email,
+                'attendance_count': u.attendance_count
+            }) for u in rows)
+            separator = ','
+        yield '[]' if separator == '[' else ']'
+
+    # Clients hold on to the list and revalidate it with If-None-Match
+    response = Response(stream_with_context(generate()), mimetype='application/json')
+    response.set_etag(users_list_etag())
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 @app.route('/admin/user/<reg_no>', methods=['GET', 'DELETE'])
 def admin_user(reg_no):
     if not verify_admin_pin():
         return jsonify({'error': 'Unauthorized: Invalid PIN'}), 403
-    user = User.query.filter_by(reg_no=reg_no).first()
-    if not user:
-        return jsonify({'error': 'User not found'}), 404
+    # One statement per request: a narrow SELECT for GET, a direct DELETE for DELETE
     if request.method == 'GET':
+        user = db.session.execute(db.select(
+            User.reg_no, User.name, User.dob, User.gender, User.email, User.attendance_count
+        ).where(User.reg_no == reg_no)).first()
+        if not user:
+            return jsonify({'error': 'User not found'}), 404
         return jsonify({
             'reg_no': user.reg_no,
             'name': user.name,
-            'age': user.age(),
+            'age': calculate_age(user.dob, date.today()),
             'gender': user.gender,
             'email': user.email,
             'attendance_count': user.attendance_count
         })
     elif request.method == 'DELETE':
-        db.session.delete(user)
+        # face_image rows go with the user through ON DELETE CASCADE
+        deleted = db.session.execute(
+            db.delete(User).where(User.reg_no == reg_no).execution_options(synchronize_session=False)
+        ).rowcount
+        if not deleted:
+            return jsonify({'error': 'User not found'}), 404
+        bump_users_version()
         db.session.commit()
         return jsonify({'success': True, 'message': f'User {reg_no} deleted.'})
 
+@app.route('/admin/bulk_register', methods=['POST'])
+def admin_bulk_register():
+    if not verify_admin_pin():
+        return jsonify({'error': 'Unauthorized: Invalid PIN'}), 403
+    entries = request.json
+    if not isinstance(entries, list) or not entries:
+        return jsonify({'error': 'Expected a non-empty JSON array of users.'}), 400
+
+    errors = []
+    parsed = []
+    seen_names = set()
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            errors.append({'index': i, 'error': 'Expected an object with name, dob and gender.'})
+            continue
+        name = str(entry.get('name', '')).strip()
+        dob_str = str(entry.get('dob', '')).strip()
+        gender = str(entry.get('gender', '')).strip()
+        if not (name and dob_str and gender):
+            errors.append({'index': i, 'error': 'Missing required fields'})
+            continue
+        try:
+            dob = datetime.strptime(dob_str, '%Y-%m-%d').date()
+        except Exception:
+            errors.append({'index': i, 'error': 'Invalid date of birth format.'})
+            continue
+        if not _normalize_name(name):
+            # Without letters there is nothing to build an email address from
+            errors.append({'index': i, 'error': 'Name must contain letters.'})
+            continue
+        if name.lower() in seen_names:
+            errors.append({'index': i, 'error': f'Duplicate name "{name}" in request.'})
+            continue
+        seen_names.add(name.lower())
+        parsed.append((i, name, dob, gender))
+
+    # Check names against the database in chunks to stay under SQLite's bound-parameter limit
+    names = [name.lower() for _, name, _, _ in parsed]
+    existing_names = set()
+    for start in range(0, len(names), BULK_INSERT_BATCH_SIZE):
+        existing_names.update(db.session.execute(
+            db.select(db.func.lower(User.name))
+            .where(db.func.lower(User.name).in_(names[start:start + BULK_INSERT_BATCH_SIZE]))
+        ).scalars())
+    for i, name, _, _ in parsed:
+        if name.lower() in existing_names:
+            errors.append({'index': i, 'error': f'User with name "{name}" already registered.'})
+    if errors:
+        errors.sort(key=lambda e: e['index'])
+        return jsonify({'error': 'No users were registered.', 'details': errors}), 400
+
+    # One query for all existing emails instead of one per generated address
+    taken_emails = set(db.session.execute(db.select(db.func.lower(User.email))).scalars())
+    next_free = {}
+    reg_nos = generate_reg_nos(len(parsed))
+    rows = []
+    for reg_no, (_, name, dob, gender) in zip(reg_nos, parsed):
+        email = generate_email(name, taken_emails, next_free)
+        taken_emails.add(email)
+        rows.append({
+            'reg_no': reg_no,
+            'name': name,
+            'dob': dob,
+            'gender': gender,
+            'email': email,
+            'attendance_count': 0,
+            'leaves_taken': 0,
+            'last_leave_month': None,
+            'messages': ''
+        })
+
+    # executemany-style multi-row INSERTs, all inside a single transaction
+    try:
+        for start in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+            db.session.execute(db.insert(User), rows[start:start + BULK_INSERT_BATCH_SIZE])
+        bump_users_version()
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent registration took one of these names or emails after the checks above
+        db.session.rollback()
+        return jsonify({'error': 'No users were registered: a name or email is already taken.'}), 400
+
+    return jsonify({
+        'success': True,
+        'count': len(rows),
+        'users': [{'reg_no': r['reg_no'], 'name': r['name'], 'email': r['email']} for r in rows]
+    })
+
 @app.route('/export', methods=['GET'])
 def export_excel():
     if request.args.get('pin') != ADMIN_PIN:
         return jsonify({'error': 'Unauthorized: Invalid PIN'}), 403
-    users = User.query.all()
-    if not users:
+    stmt = db.select(
+        User.reg_no, User.name, User.dob, User.gender, User.email,
+        User.attendance_count, User.leaves_taken, User.messages
+    ).execution_options(stream_results=True)
+    today = date.today()
+    # constant_memory flushes each row to disk as soon as the next one starts, so rows
+    # must be written in order (pandas' ExcelWriter writes column by column)
+    output = tempfile.TemporaryFile()
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+    worksheet = workbook.add_worksheet('Users')
+    header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center'})
+    row_idx = 0
+    # Read and write in batches so neither the DataFrame nor the workbook holds every user
+    chunks = pd.read_sql_query(stmt, db.session.connection(), parse_dates=['dob'], chunksize=STREAM_BATCH_SIZE)
+    for chunk in chunks:
+        df = pd.DataFrame({
+            'RegNo': chunk['reg_no'],
+            'Name': chunk['name'],
+            'Age': calculate_ages(chunk['dob'], today),
+            'Gender': chunk['gender'],
+            'Email': chunk['email'],
+            'Attendance Count': chunk['attendance_count'].fillna(0),
+            'Date of Birth': chunk['dob'].dt.strftime('%Y-%m-%d'),
+            'Leaves Taken': chunk['leaves_taken'].fillna(0),
+            'Messages': chunk['messages'].fillna('')
+        })
+        if row_idx == 0:
+            worksheet.write_row(0, 0, df.columns, header_format)
+        for row in df.itertuples(index=False, name=None):
+            row_idx += 1
+            worksheet.write_row(row_idx, 0, row)
+    workbook.close()
+    if row_idx == 0:
+        output.close()
         return jsonify({'error': 'No user data to export.'}), 400
-    df = pd.DataFrame([{
-        'RegNo': u.reg_no,
-        'Name': u.name,
-        'Age': u.age(),
-        'Gender': u.gender,
-        'Email': u.email,
-        'Attendance Count': u.attendance_count,
-        'Date of Birth': u.dob.strftime('%Y-%m-%d'),
-        'Leaves Taken': u.leaves_taken,
-        'Messages': u.messages or ''
-    } for u in users])
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False, sheet_name='Users')
     output.seek(0)
     return send_file(output, download_name="FaceAttendanceUsers.xlsx", as_attachment=True)
 
@@ -242,7 +629,6 @@ def check_status():
     if user.last_leave_month != current_month_str:
         user.leaves_taken = 0
         user.last_leave_month = current_month_str
-        db.session.commit()
 
     attendance_count = user.attendance_count
     leaves_taken = user.leaves_taken
@@ -261,8 +647,12 @@ def check_status():
     if not messages:
         messages.append("Your attendance and leave status are within acceptable limits.")
 
-    user.messages = ' | '.join(messages)
-    db.session.commit()
+    messages_str = ' | '.join(messages)
+    if user.messages != messages_str:
+        user.messages = messages_str
+    # Commit the month reset and the new messages together, and skip the write if nothing changed
+    if db.session.is_modified(user):
+        db.session.commit()
 
     return jsonify({
         'name': user.name,
@@ -287,6 +677,7 @@ TEMPLATE_HTML = """
   #user-list { max-height: 300px; overflow-y: auto; }
   #user-list table { width: 100%; border-collapse: collapse; }
   #user-list th, #user-list td { border: 1px solid rgba(255,255,255,0.3); padding: 8px; text-align: center; }
+  #user-list td { white-space: nowrap; }
   #user-list th { background-color: rgba(255,255,255,0.1); }
   #user-list::-webkit-scrollbar { width: 6px; }
   #user-list::-webkit-scrollbar-thumb { background-color: rgba(255,255,255,0.3); border-radius: 3px; }
@@ -406,6 +797,7 @@ TEMPLATE_HTML = """
      <i class="fas fa-search fa-3x mb-4 text-yellow-400"></i>
      <h4 class="text-xl font-semibold mb-2">Search User by RegNo</h4>
      <p>Find user details quickly by entering their registration number.</p>
+     <input autocomplete="off" class="mt-4 w-full rounded px-3 py-2 text-gray-900 text-center uppercase" id="admin-search-regno" placeholder="e.g. 2025-XYZ-0001" type="text"/>
     </div>
     <div class="bg-indigo-700 bg-opacity-40 rounded-lg p-6 shadow-md hover:bg-indigo-800 transition cursor-pointer flex flex-col items-center text-center" id="admin-view-users">
      <i class="fas fa-users fa-3x mb-4 text-yellow-400"></i>
@@ -421,6 +813,7 @@ TEMPLATE_HTML = """
    <p class="text-center font-semibold text-yellow-400 mb-6 flex-grow" id="admin-message"></p>
    <div class="overflow-auto" id="user-list" style="display:none; max-height: 50vh;">
     <h3 class="text-2xl font-bold mb-4 text-yellow-400 text-center">Registered Users</h3>
+    <input autocomplete="off" class="mb-4 w-full rounded px-3 py-2 text-gray-900" id="admin-users-filter" placeholder="Filter by RegNo or name (starts with)" type="text"/>
     <table class="min-w-full table-auto border-collapse border border-yellow-400 text-white">
      <thead>
       <tr>
@@ -458,6 +851,56 @@ TEMPLATE_HTML = """
 </footer>
 
 <script>
+  // Every backend call goes through here. The browser already pools and reuses
+  // connections per origin, so this only centralizes the request defaults.
+  function api(path, opts = {}) {
+    return fetch(path, {
+      credentials: 'same-origin',
+      ...opts,
+      headers: { 'Accept': 'application/json', ...(opts.headers || {}) },
+    });
+  }
+  // DOM updates queued during one tick run together in the next animation frame,
+  // so a status message and the list it describes cost a single layout
+  let pendingRenders = null;
+  function scheduleRender(fn) {
+    if (pendingRenders) {
+      pendingRenders.push(fn);
+      return;
+    }
+    pendingRenders = [fn];
+    requestAnimationFrame(() => {
+      const queue = pendingRenders;
+      pendingRenders = null;
+      for (const render of queue) render();
+    });
+  }
+
+  // One controller per call site; starting a request there aborts the one it supersedes
+  let searchCtl, viewCtl, statusCtl;
+
+  // Status lines keep their layout classes from the markup; only the colour class is swapped
+  const STATUS_CLASSES = {
+    error: 'text-red-400',
+    ok: 'text-green-400',
+    warn: 'text-yellow-300',
+  };
+  const STATUS_COLOURS = ['text-white', 'text-yellow-400', ...Object.values(STATUS_CLASSES)];
+
+  function recolourStatus(el, kind) {
+    el.classList.remove(...STATUS_COLOURS);
+    el.classList.add(STATUS_CLASSES[kind]);
+  }
+  // Clears a status line and, given a kind, recolours it
+  function resetStatus(el, kind) {
+    el.replaceChildren();
+    if (kind) recolourStatus(el, kind);
+  }
+  function setStatus(el, kind, text) {
+    recolourStatus(el, kind);
+    el.textContent = text;
+  }
+
   // Mobile menu toggle
   const menuBtn = document.getElementById('mobile-menu-button');
   const mobileMenu = document.getElementById('mobile-menu');
@@ -482,17 +925,17 @@ TEMPLATE_HTML = """
   }
 
   function clearMessages() {
-    document.getElementById('face-rec-message').textContent = '';
-    document.getElementById('admin-message').textContent = '';
+    resetStatus(document.getElementById('face-rec-message'));
+    resetStatus(document.getElementById('admin-message'));
     clearRegistrationMessages();
   }
   function clearRegistrationMessages() {
-    document.getElementById('registration-error').textContent = '';
-    document.getElementById('registration-success').textContent = '';
+    resetStatus(document.getElementById('registration-error'));
+    resetStatus(document.getElementById('registration-success'));
   }
   function clearEmailCheck() {
     document.getElementById('email-check').value = '';
-    document.getElementById('attendance-status').textContent = '';
+    resetStatus(document.getElementById('attendance-status'));
   }
 
   // Desktop nav buttons
@@ -574,7 +1017,7 @@ TEMPLATE_HTML = """
         ctx.drawImage(video, 0, 0, canvas.width, canvas.height);
         const imgData = canvas.toDataURL('image/png');
 
-        const res = await fetch('/recognize', {
+        const res = await api('/recognize', {
           method: 'POST',
           headers: { 'Content-Type': 'application/json' },
           body: JSON.stringify({ face_image: imgData })
@@ -590,8 +1033,7 @@ TEMPLATE_HTML = """
       }, 3000);
 
     } catch (err) {
-      faceRecMessage.textContent = 'Error accessing webcam: ' + err.message;
-      faceRecMessage.className = 'mt-4 text-center font-semibold text-red-400';
+      setStatus(faceRecMessage, 'error', 'Error accessing webcam: ' + err.message);
     }
   }
   function stopVideoStream() {
@@ -600,11 +1042,11 @@ TEMPLATE_HTML = """
       stream = null;
     }
     video.style.display = 'none';
-    faceRecMessage.textContent = '';
+    resetStatus(faceRecMessage);
     registerNewUserBtn.classList.add('hidden');
   }
   startFaceRecBtn.addEventListener('click', () => {
-    faceRecMessage.className = 'mt-4 text-center font-semibold text-yellow-300';
+    resetStatus(faceRecMessage, 'warn');
     startWebcam();
   });
   registerNewUserBtn.addEventListener('click', () => {
@@ -628,12 +1070,12 @@ TEMPLATE_HTML = """
   const regForm = document.getElementById('register-form');
 
   let regStream = null;
-  let faceCapturedImageData = null;
+  let faceCapturedBlob = null;
 
   function openRegistrationModal() {
     registrationModal.classList.remove('hidden');
-    registrationError.textContent = '';
-    registrationSuccess.textContent = '';
+    resetStatus(registrationError);
+    resetStatus(registrationSuccess);
     submitRegistrationBtn.disabled = true;
     captureWarning.style.display = 'none';
     regForm.reset();
@@ -652,7 +1094,7 @@ TEMPLATE_HTML = """
       regStream = await navigator.mediaDevices.getUserMedia({ video: true });
       regVideo.srcObject = regStream;
       regVideo.style.display = 'block';
-      faceCapturedImageData = null;
+      faceCapturedBlob = null;
       submitRegistrationBtn.disabled = true;
       captureWarning.style.display = 'none';
     } catch (err) {
@@ -666,34 +1108,63 @@ TEMPLATE_HTML = """
     }
     regVideo.style.display = 'none';
   }
+  // The uploaded face is a square center crop of the frame at the size face embedding
+  // models take as input, not the full camera frame
+  const FACE_UPLOAD_SIZE = 224;
+  const faceUploadCanvas = document.createElement('canvas');
+  faceUploadCanvas.width = faceUploadCanvas.height = FACE_UPLOAD_SIZE;
+  const faceUploadCtx = faceUploadCanvas.getContext('2d');
+  faceUploadCtx.imageSmoothingQuality = 'high';
+
   regVideo.addEventListener('click', () => {
-    if (!regStream) return;
+    if (!regStream || !regVideo.videoWidth) return;
     ctx.drawImage(regVideo, 0, 0, faceCanvas.width, faceCanvas.height);
-    faceCapturedImageData = faceCanvas.toDataURL('image/png');
+    const side = Math.min(regVideo.videoWidth, regVideo.videoHeight);
+    faceUploadCtx.drawImage(
+      regVideo,
+      (regVideo.videoWidth - side) / 2, (regVideo.videoHeight - side) / 2, side, side,
+      0, 0, FACE_UPLOAD_SIZE, FACE_UPLOAD_SIZE
+    );
+    // Keep the capture as JPEG bytes; it is uploaded as a file rather than a base64 data URL
+    submitRegistrationBtn.disabled = true;
+    faceUploadCanvas.toBlob(blob => {
+      faceCapturedBlob = blob;
+      submitRegistrationBtn.disabled = !blob;
+    }, 'image/jpeg', 0.85);
     captureWarning.style.display = 'none';
-    submitRegistrationBtn.disabled = false;
-    registrationError.textContent = '';
+    resetStatus(registrationError);
   });
 
-  regNameInput.addEventListener('input', () => {
+  // Email preview: regexes are built once, and the preview is only rebuilt once typing pauses
+  const RE_DIACRITICS = /[\u0300-\u036f]/g;
+  const RE_NONALPHA = /[^a-z\s]/g;
+  const RE_SPLIT = /\s+/;
+  let emailPreviewTimer = null;
+
+  function updateEmailPreview() {
     const name = regNameInput.value.trim();
     if (!name) {
       regEmailInput.value = '';
       return;
     }
-    const parts = name.toLowerCase().normalize('NFD').replace(/[\u0300-\u036f]/g, '').replace(/[^a-z\s]/g, '').split(/\s+/);
+    const parts = name.toLowerCase().normalize('NFD').replace(RE_DIACRITICS, '').replace(RE_NONALPHA, '').split(RE_SPLIT);
     if(parts.length === 1) regEmailInput.value = parts[0] + '@company.com';
     else if(parts.length > 1) regEmailInput.value = parts[0] + '.' + parts[parts.length - 1] + '@company.com';
     else regEmailInput.value = '';
-    registrationError.textContent = '';
-    registrationSuccess.textContent = '';
+  }
+
+  regNameInput.addEventListener('input', () => {
+    resetStatus(registrationError);
+    resetStatus(registrationSuccess);
+    clearTimeout(emailPreviewTimer);
+    emailPreviewTimer = setTimeout(updateEmailPreview, 150);
   });
   regDobInput.max = new Date().toISOString().split('T')[0];
 
   regForm.addEventListener('submit', async e => {
     e.preventDefault();
-    registrationError.textContent = '';
-    registrationSuccess.textContent = '';
+    resetStatus(registrationError);
+    resetStatus(registrationSuccess);
 
     const name = regNameInput.value.trim();
     const dob = regDobInput.value;
@@ -704,23 +1175,26 @@ TEMPLATE_HTML = """
       registrationError.textContent = 'Please fill in all required fields.';
       return;
     }
-    if (!faceCapturedImageData) {
+    if (!faceCapturedBlob) {
       registrationError.textContent = 'Please capture your face by clicking on the video.';
       captureWarning.style.display = 'block';
       return;
     }
 
     try {
-      const res = await fetch('/register', {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ name, dob, gender, face_image: faceCapturedImageData })
-      });
+      // Multipart upload; the browser sets the Content-Type boundary itself
+      const formData = new FormData();
+      formData.append('name', name);
+      formData.append('dob', dob);
+      formData.append('gender', gender);
+      formData.append('face_image', faceCapturedBlob, 'face.jpg');
+      const res = await api('/register', { method: 'POST', body: formData });
       const data = await res.json();
       if (data.error) {
         registrationError.textContent = data.error;
       } else if (data.success) {
         registrationSuccess.textContent = `User registered successfully: ${data.name} (${data.reg_no})`;
+        clearUsersCache();
         submitRegistrationBtn.disabled = true;
         setTimeout(() => {
           closeRegistrationModal();
@@ -736,6 +1210,7 @@ TEMPLATE_HTML = """
   const adminViewUsersBtn = document.getElementById('admin-view-users');
   const adminDeleteUserBtn = document.getElementById('admin-delete-user');
   const adminMessage = document.getElementById('admin-message');
+  const adminSearchInput = document.getElementById('admin-search-regno');
   const userListDiv = document.getElementById('user-list');
   const userListBody = document.getElementById('user-list-body');
 
@@ -822,7 +1297,7 @@ TEMPLATE_HTML = """
     if(!pin) return; // User cancelled
     // Test PIN via a test API call (e.g. fetching users)
     try {
-      const res = await fetch('/admin/users?pin=' + encodeURIComponent(pin));
+      const res = await api('/admin/users?limit=1&pin=' + encodeURIComponent(pin));
       if(res.status === 403) {
         pinError.textContent = "Unauthorized: Invalid PIN";
         pinError.classList.remove('hidden');
@@ -838,68 +1313,269 @@ TEMPLATE_HTML = """
     }
   }
 
-  adminSearchUserBtn.addEventListener('click', async () => {
+  // Recent lookups keyed by normalized RegNo. A Map iterates in insertion order,
+  // so re-inserting on every hit keeps the least recently used entry first.
+  const SEARCH_CACHE_LIMIT = 50;
+  const SEARCH_CACHE_TTL = 30000;
+  const searchCache = new Map();
+  let searchTimer = null;
+
+  function cacheSearchResult(regNo, user) {
+    searchCache.delete(regNo);
+    searchCache.set(regNo, { user, ts: Date.now() });
+    if (searchCache.size > SEARCH_CACHE_LIMIT) {
+      searchCache.delete(searchCache.keys().next().value);
+    }
+  }
+
+  // keepList leaves the user table open, for lookups started from one of its rows
+  function renderSearchResult(regNo, user, keepList = false) {
+    scheduleRender(() => {
+      if (!user) {
+        setStatus(adminMessage, 'error', `No user found with RegNo: ${regNo}`);
+      } else {
+        setStatus(adminMessage, 'ok', `User found: ${user.name} (RegNo: ${user.reg_no}), Age: ${user.age}, Gender: ${user.gender}, Email: ${user.email}, Attendance Count: ${user.attendance_count}`);
+      }
+      if (!keepList) hideUserList();
+    });
+  }
+
+  async function searchUser(regNo, keepList = false) {
     if (!adminPin) {
       await requestPinAndThen(() => {});  // First ensure PIN is entered
       if(!adminPin) return;
     }
-    const regNo = prompt('Enter Registration Number to search:');
-    if (!regNo) {
-      adminMessage.textContent = 'Search cancelled.';
-      adminMessage.className = 'mt-6 text-center font-semibold text-red-400';
-      return;
+    searchCtl?.abort();
+    searchCtl = new AbortController();
+    const { signal } = searchCtl;
+    const cached = searchCache.get(regNo);
+    if (cached) {
+      // Move the hit to the most recently used end without resetting its age
+      searchCache.delete(regNo);
+      searchCache.set(regNo, cached);
+      renderSearchResult(regNo, cached.user, keepList);
+      // Fresh hits skip the server; stale ones are shown now and revalidated below
+      if (Date.now() - cached.ts < SEARCH_CACHE_TTL) return;
     }
     try {
-      const res = await fetch('/admin/user/' + regNo + '?pin=' + encodeURIComponent(adminPin));
+      const res = await api('/admin/user/' + encodeURIComponent(regNo) + '?pin=' + encodeURIComponent(adminPin), { signal });
       if(res.status === 403){
-        adminMessage.textContent = 'Unauthorized: Invalid PIN';
-        adminMessage.className = 'mt-6 text-center font-semibold text-red-400';
+        setStatus(adminMessage, 'error', 'Unauthorized: Invalid PIN');
         adminPin = null;
+        searchCache.clear();
         return;
       }
-      if(res.status === 404){
-        adminMessage.textContent = `No user found with RegNo: ${regNo.toUpperCase()}`;
-        adminMessage.className = 'mt-6 text-center font-semibold text-red-400';
-        return;
+      let user = null;
+      if (res.status === 404) {
+        searchCache.delete(regNo);
+      } else {
+        if (!res.ok) throw new Error('HTTP ' + res.status);
+        user = await res.json();
+        cacheSearchResult(regNo, user);
+      }
+      // Only render if the box still holds this RegNo; a newer search owns the message otherwise
+      if (adminSearchInput.value.trim().toUpperCase() === regNo) {
+        renderSearchResult(regNo, user, keepList);
       }
-      const user = await res.json();
-      adminMessage.textContent = `User found: ${user.name} (RegNo: ${user.reg_no}), Age: ${user.age}, Gender: ${user.gender}, Email: ${user.email}, Attendance Count: ${user.attendance_count}`;
-      adminMessage.className = 'mt-6 text-center font-semibold text-green-400';
-      hideUserList();
     } catch (err) {
-      adminMessage.textContent = 'Error searching user: ' + err.message;
-      adminMessage.className = 'mt-6 text-center font-semibold text-red-400';
+      if (err.name === 'AbortError' || cached) return;
+      setStatus(adminMessage, 'error', 'Error searching user: ' + err.message);
+    }
+  }
+
+  adminSearchInput.addEventListener('input', () => {
+    clearTimeout(searchTimer);
+    const regNo = adminSearchInput.value.trim().toUpperCase();
+    if (!regNo) {
+      resetStatus(adminMessage);
+      return;
+    }
+    searchTimer = setTimeout(() => searchUser(regNo), 250);
+  });
+
+  adminSearchUserBtn.addEventListener('click', async () => {
+    if (!adminPin) {
+      await requestPinAndThen(() => {});  // First ensure PIN is entered
+      if(!adminPin) return;
     }
+    adminSearchInput.focus();
   });
 
+  // /admin/users is read one page at a time; more pages are requested as the table scrolls.
+  // Each page is cached with its ETag under its query string and mirrored to sessionStorage.
+  // Within USERS_CACHE_FRESH a page is shown as is; after that it is revalidated with If-None-Match.
+  const USERS_PAGE_SIZE = 100;
+  const USERS_PREFETCH_MARGIN = 50;
+  const USERS_CACHE_KEY = 'admin_users_cache';
+  const USERS_CACHE_FRESH = 15000;
+  const USERS_CACHE_PAGES = 20;
+  const usersFilterInput = document.getElementById('admin-users-filter');
+  let usersCache = readUsersCache();
+  let usersQuery = '';
+  let usersListVersion = 0;
+  let listedVersion = 0;  // usersListVersion of the listing currently held in listedUsers
+  let usersExhausted = true;
+  let usersLoading = false;
+  let usersFilterTimer = null;
+
+  function readUsersCache() {
+    try {
+      return JSON.parse(sessionStorage.getItem(USERS_CACHE_KEY)) || {};
+    } catch (e) {
+      return {};
+    }
+  }
+  function writeUsersCache(cache) {
+    usersCache = cache;
+    try {
+      sessionStorage.setItem(USERS_CACHE_KEY, JSON.stringify(cache));
+    } catch (e) {
+      // Storage full or disabled: the in-memory copy still works
+    }
+  }
+  function clearUsersCache() {
+    writeUsersCache({});
+  }
+  function cacheUsersPage(key, entry) {
+    // Object keys keep insertion order, so dropping from the front evicts the oldest pages
+    const entries = Object.entries(usersCache).filter(([k]) => k !== key);
+    entries.push([key, entry]);
+    writeUsersCache(Object.fromEntries(entries.slice(-USERS_CACHE_PAGES)));
+  }
+
+  // Resolves to null when the server rejects the PIN
+  async function loadUsersPage(offset, q, signal) {
+    const params = new URLSearchParams({ offset, limit: USERS_PAGE_SIZE, q });
+    const key = params.toString();
+    const cached = usersCache[key];
+    if (cached && Date.now() - cached.ts < USERS_CACHE_FRESH) {
+      return cached.users;
+    }
+    // The PIN rides along on the request but is not part of the cache key
+    const url = '/admin/users?' + params + '&pin=' + encodeURIComponent(adminPin);
+    const headers = cached && cached.etag ? { 'If-None-Match': cached.etag } : {};
+    const res = await api(url, { headers, signal });
+    if (res.status === 403) {
+      clearUsersCache();
+      return null;
+    }
+    if (res.status === 304 && cached) {
+      cacheUsersPage(key, { ...cached, ts: Date.now() });
+      return cached.users;
+    }
+    if (!res.ok) throw new Error('HTTP ' + res.status);
+    const users = await res.json();
+    cacheUsersPage(key, { etag: res.headers.get('ETag'), users, ts: Date.now() });
+    return users;
+  }
+
+  // Starts a new listing for `q`. Resolves to undefined when a newer listing was started meanwhile.
+  async function loadFirstUsersPage(q) {
+    const version = ++usersListVersion;
+    viewCtl?.abort();
+    viewCtl = new AbortController();
+    const users = await loadUsersPage(0, q, viewCtl.signal);
+    if (version !== usersListVersion) return undefined;
+    return users;
+  }
+
+  // Makes a fetched first page the current listing. Runs in the same deferred render as the
+  // table update, so the rows, their query and the paging state always change together.
+  function showUserListing(q, users) {
+    listedVersion = usersListVersion;
+    usersQuery = q;
+    usersExhausted = users.length < USERS_PAGE_SIZE;
+    showUserList(users);
+  }
+
+  async function loadMoreUsers() {
+    // Until the deferred render swaps in a new listing, listedUsers belongs to the old one
+    if (usersLoading || usersExhausted || listedVersion !== usersListVersion) return;
+    usersLoading = true;
+    const version = usersListVersion;
+    let page = null;
+    try {
+      page = await loadUsersPage(listedUsers.length, usersQuery, viewCtl.signal);
+    } catch (err) {
+      if (version === usersListVersion) {
+        usersExhausted = true;
+        setStatus(adminMessage, 'error', 'Error loading users: ' + err.message);
+      }
+    } finally {
+      usersLoading = false;
+    }
+    if (version !== usersListVersion) return;
+    usersExhausted = !page || page.length < USERS_PAGE_SIZE;
+    if (page && page.length) appendUserRows(page);
+  }
+
   adminViewUsersBtn.addEventListener('click', async () => {
     if (!adminPin) {
       await requestPinAndThen(() => {});  // First ensure PIN is entered
       if (!adminPin) return;
     }
     try {
-      const res = await fetch('/admin/users?pin=' + encodeURIComponent(adminPin));
-      if(res.status === 403) {
-        adminMessage.textContent = 'Unauthorized: Invalid PIN';
-        adminMessage.className = 'mt-6 text-center font-semibold text-red-400';
+      usersFilterInput.value = '';
+      const users = await loadFirstUsersPage('');
+      if(users === undefined) return;
+      if(users === null) {
         adminPin = null;
+        scheduleRender(() => {
+          setStatus(adminMessage, 'error', 'Unauthorized: Invalid PIN');
+          hideUserList();
+        });
         return;
       }
-      const users = await res.json();
-      if(users.length === 0){
-        adminMessage.textContent = 'No registered users found.';
-        adminMessage.className = 'mt-6 text-center font-semibold text-red-400';
-        hideUserList();
-        return;
-      }
-      adminMessage.textContent = '';
-      showUserList(users);
+      const version = usersListVersion;
+      scheduleRender(() => {
+        // A newer listing started before this frame owns the table
+        if (version !== usersListVersion) return;
+        if(users.length === 0){
+          setStatus(adminMessage, 'error', 'No registered users found.');
+          hideUserList();
+          return;
+        }
+        resetStatus(adminMessage);
+        showUserListing('', users);
+      });
     } catch(err) {
-      adminMessage.textContent = 'Error loading users: ' + err.message;
-      adminMessage.className = 'mt-6 text-center font-semibold text-red-400';
+      if (err.name === 'AbortError') return;
+      setStatus(adminMessage, 'error', 'Error loading users: ' + err.message);
     }
   });
 
+  usersFilterInput.addEventListener('input', () => {
+    clearTimeout(usersFilterTimer);
+    usersFilterTimer = setTimeout(async () => {
+      try {
+        const q = usersFilterInput.value.trim();
+        const users = await loadFirstUsersPage(q);
+        if(users === undefined) return;
+        if(users === null) {
+          adminPin = null;
+          scheduleRender(() => {
+            setStatus(adminMessage, 'error', 'Unauthorized: Invalid PIN');
+            hideUserList();
+          });
+          return;
+        }
+        const version = usersListVersion;
+        scheduleRender(() => {
+          if (version !== usersListVersion) return;
+          if(users.length === 0){
+            setStatus(adminMessage, 'error', 'No users match this filter.');
+          } else {
+            resetStatus(adminMessage);
+          }
+          showUserListing(q, users);
+        });
+      } catch(err) {
+        if (err.name === 'AbortError') return;
+        setStatus(adminMessage, 'error', 'Error loading users: ' + err.message);
+      }
+    }, 250);
+  });
+
   adminDeleteUserBtn.addEventListener('click', async () => {
     if (!adminPin) {
       await requestPinAndThen(() => {});  // First ensure PIN is entered
@@ -907,58 +1583,151 @@ TEMPLATE_HTML = """
     }
     const regNo = prompt('Enter Registration Number to delete:');
     if (!regNo) {
-      adminMessage.textContent = 'Delete cancelled.';
-      adminMessage.className = 'mt-6 text-center font-semibold text-red-400';
+      setStatus(adminMessage, 'error', 'Delete cancelled.');
       return;
     }
     const confirmDelete = confirm(`Are you sure you want to delete user with RegNo: ${regNo.toUpperCase()}?`);
     if (!confirmDelete) {
-      adminMessage.textContent = 'Delete cancelled.';
-      adminMessage.className = 'mt-6 text-center font-semibold text-red-400';
+      setStatus(adminMessage, 'error', 'Delete cancelled.');
       return;
     }
     try {
-      const res = await fetch('/admin/user/' + regNo + '?pin=' + encodeURIComponent(adminPin), { method: 'DELETE' });
+      const res = await api('/admin/user/' + regNo + '?pin=' + encodeURIComponent(adminPin), { method: 'DELETE' });
       if(res.status === 403){
-        adminMessage.textContent = 'Unauthorized: Invalid PIN';
-        adminMessage.className = 'mt-6 text-center font-semibold text-red-400';
+        setStatus(adminMessage, 'error', 'Unauthorized: Invalid PIN');
         adminPin = null;
         return;
       }
       const data = await res.json();
       if(data.success){
-        adminMessage.textContent = data.message;
-        adminMessage.className = 'mt-6 text-center font-semibold text-green-400';
-        hideUserList();
+        searchCache.delete(regNo.trim().toUpperCase());
+        clearUsersCache();
+        scheduleRender(() => {
+          setStatus(adminMessage, 'ok', data.message);
+          hideUserList();
+        });
       } else {
-        adminMessage.textContent = data.error || 'Delete failed.';
-        adminMessage.className = 'mt-6 text-center font-semibold text-red-400';
+        setStatus(adminMessage, 'error', data.error || 'Delete failed.');
       }
     } catch(err) {
-      adminMessage.textContent = 'Error deleting user: ' + err.message;
-      adminMessage.className = 'mt-6 text-center font-semibold text-red-400';
+      setStatus(adminMessage, 'error', 'Error deleting user: ' + err.message);
     }
   });
 
-  function showUserList(users) {
-    userListBody.innerHTML = '';
-    users.forEach(user => {
-      const tr = document.createElement('tr');
-      tr.innerHTML = `
-        <td class="border border-yellow-400 px-3 py-2">${user.reg_no}</td>
-        <td class="border border-yellow-400 px-3 py-2">${user.name}</td>
-        <td class="border border-yellow-400 px-3 py-2">${user.age}</td>
-        <td class="border border-yellow-400 px-3 py-2">${user.gender}</td>
-        <td class="border border-yellow-400 px-3 py-2">${user.email}</td>
-        <td class="border border-yellow-400 px-3 py-2">${user.attendance_count}</td>
-      `;
-      userListBody.appendChild(tr);
+  // The user table is virtualized: only the rows in view (plus some overscan) are in the DOM,
+  // and spacer rows above and below keep the scrollbar sized for the full list.
+  const USER_ROW_OVERSCAN = 10;
+  const USER_COLUMNS = ['reg_no', 'name', 'age', 'gender', 'email', 'attendance_count'];
+  const ROW_TEMPLATE = document.createElement('template');
+  ROW_TEMPLATE.innerHTML = '<tr class="cursor-pointer" title="Click to look up this user">' + '<td class="border border-yellow-400 px-3 py-2"></td>'.repeat(USER_COLUMNS.length) + '</tr>';
+  const userRowPool = [];
+  const topSpacer = createSpacerRow();
+  const bottomSpacer = createSpacerRow();
+  let listedUsers = [];
+  let userRowHeight = 0;
+  let renderedRange = null;
+  let userListScrollPending = false;
+
+  function createSpacerRow() {
+    const tr = document.createElement('tr');
+    const td = document.createElement('td');
+    td.colSpan = USER_COLUMNS.length;
+    td.style.padding = '0';
+    td.style.border = 'none';
+    tr.appendChild(td);
+    return tr;
+  }
+  function setSpacerHeight(spacer, height) {
+    spacer.style.display = height > 0 ? '' : 'none';
+    spacer.firstChild.style.height = height + 'px';
+  }
+  function createUserRow() {
+    return ROW_TEMPLATE.content.firstElementChild.cloneNode(true);
+  }
+  function fillUserRow(tr, user) {
+    tr.dataset.regNo = user.reg_no;
+    for (let i = 0; i < USER_COLUMNS.length; i++) {
+      tr.children[i].textContent = user[USER_COLUMNS[i]];
+    }
+  }
+
+  function renderVisibleUserRows() {
+    const total = listedUsers.length;
+    if (!total) {
+      userListBody.replaceChildren();
+      return;
+    }
+    if (!userRowHeight) {
+      // Measure one real row; cells don't wrap, so every row has this height
+      const probe = userRowPool[0] || (userRowPool[0] = createUserRow());
+      fillUserRow(probe, listedUsers[0]);
+      userListBody.replaceChildren(probe);
+      userRowHeight = probe.getBoundingClientRect().height || 40;
+    }
+    // The title and table header scroll with the rows, so measure from the top of the body
+    const containerRect = userListDiv.getBoundingClientRect();
+    const bodyTop = userListBody.getBoundingClientRect().top - containerRect.top + userListDiv.scrollTop;
+    const viewportHeight = parseFloat(getComputedStyle(userListDiv).maxHeight) || userListDiv.clientHeight;
+    const scrolled = Math.max(0, userListDiv.scrollTop - bodyTop);
+    const start = Math.max(0, Math.floor(scrolled / userRowHeight) - USER_ROW_OVERSCAN);
+    const end = Math.min(total, Math.ceil((scrolled + viewportHeight) / userRowHeight) + USER_ROW_OVERSCAN);
+    if (end > total - USERS_PREFETCH_MARGIN) loadMoreUsers();
+    if (renderedRange && renderedRange.start === start && renderedRange.end === end) return;
+    renderedRange = { start, end };
+
+    // Assemble the window off-document and swap it in with a single insert
+    const frag = document.createDocumentFragment();
+    setSpacerHeight(topSpacer, start * userRowHeight);
+    frag.appendChild(topSpacer);
+    for (let i = start; i < end; i++) {
+      const tr = userRowPool[i - start] || (userRowPool[i - start] = createUserRow());
+      fillUserRow(tr, listedUsers[i]);
+      frag.appendChild(tr);
+    }
+    setSpacerHeight(bottomSpacer, (total - end) * userRowHeight);
+    frag.appendChild(bottomSpacer);
+    userListBody.replaceChildren(frag);
+  }
+
+  userListDiv.addEventListener('scroll', () => {
+    if (userListScrollPending) return;
+    userListScrollPending = true;
+    requestAnimationFrame(() => {
+      userListScrollPending = false;
+      renderVisibleUserRows();
     });
+  });
+
+  // Rows are pooled and refilled on scroll, so row clicks are handled once on the body
+  userListBody.addEventListener('click', e => {
+    const tr = e.target.closest('tr[data-reg-no]');
+    if (!tr) return;
+    // Setting the value from script fires no input event, so run the lookup directly
+    clearTimeout(searchTimer);
+    adminSearchInput.value = tr.dataset.regNo;
+    searchUser(tr.dataset.regNo, true);
+  });
+
+  function showUserList(users) {
+    // Copy, since later pages are appended in place and `users` may be a cached page
+    listedUsers = users.slice();
+    renderedRange = null;
     userListDiv.style.display = 'block';
+    userListDiv.scrollTop = 0;
+    renderVisibleUserRows();
+  }
+  function appendUserRows(users) {
+    listedUsers.push(...users);
+    renderedRange = null;
+    renderVisibleUserRows();
   }
   function hideUserList() {
+    usersListVersion++;
+    viewCtl?.abort();
     userListDiv.style.display = 'none';
-    userListBody.innerHTML = '';
+    listedUsers = [];
+    renderedRange = null;
+    userListBody.replaceChildren();
   }
 
   // Check attendance and leave status by email
@@ -966,43 +1735,67 @@ TEMPLATE_HTML = """
   const checkAttendanceBtn = document.getElementById('check-attendance-btn');
   const attendanceStatusDiv = document.getElementById('attendance-status');
 
+  // Static part of the status card, parsed once; each lookup only fills in text
+  const STATUS_TEMPLATE = document.createElement('template');
+  STATUS_TEMPLATE.innerHTML = `
+    <p><strong>Name:</strong> <span data-field="name"></span></p>
+    <p><strong>Attendance Count:</strong> <span data-field="attendance_count"></span></p>
+    <p><strong>Leaves Taken This Month:</strong> <span data-field="leaves_taken"></span></p>
+    <p><strong>Attendance %:</strong> <span data-field="attendance_percent"></span>%</p>
+    <div class="mt-2 space-y-1" data-messages></div>`;
+
+  function renderAttendanceStatus(data) {
+    const card = STATUS_TEMPLATE.content.cloneNode(true);
+    for (const field of card.querySelectorAll('[data-field]')) {
+      field.textContent = data[field.dataset.field];
+    }
+    const messages = document.createDocumentFragment();
+    for (const message of data.messages) {
+      const p = document.createElement('p');
+      p.textContent = message;
+      messages.appendChild(p);
+    }
+    card.querySelector('[data-messages]').appendChild(messages);
+    resetStatus(attendanceStatusDiv, 'warn');
+    attendanceStatusDiv.appendChild(card);
+  }
+
   checkAttendanceBtn.addEventListener('click', async () => {
     const email = emailCheckInput.value.trim();
-    attendanceStatusDiv.textContent = '';
+    // A newer check supersedes any request still in flight
+    statusCtl?.abort();
+    statusCtl = new AbortController();
+    resetStatus(attendanceStatusDiv);
     if (!email) {
-      attendanceStatusDiv.textContent = 'Please enter an email address.';
-      attendanceStatusDiv.className = 'mt-4 text-center font-semibold text-red-500';
+      setStatus(attendanceStatusDiv, 'error', 'Please enter an email address.');
       return;
     }
     try {
-      const res = await fetch('/status', {
+      const res = await api('/status', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ email })
+        body: JSON.stringify({ email }),
+        signal: statusCtl.signal
       });
       const data = await res.json();
       if(data.error){
-        attendanceStatusDiv.textContent = data.error;
-        attendanceStatusDiv.className = 'mt-4 text-center font-semibold text-red-500';
+        setStatus(attendanceStatusDiv, 'error', data.error);
         return;
       }
-      attendanceStatusDiv.innerHTML = `
-        <p><strong>Name:</strong> ${data.name}</p>
-        <p><strong>Attendance Count:</strong> ${data.attendance_count}</p>
-        <p><strong>Leaves Taken This Month:</strong> ${data.leaves_taken}</p>
-        <p><strong>Attendance %:</strong> ${data.attendance_percent}%</p>
-        <div class="mt-2 space-y-1">${data.messages.map(m => `<p>${m}</p>`).join('')}</div>
-      `;
-      attendanceStatusDiv.className = 'mt-4 text-center font-semibold text-yellow-300';
+      renderAttendanceStatus(data);
     } catch (err) {
-      attendanceStatusDiv.textContent = 'Error checking status: ' + err.message;
-      attendanceStatusDiv.className = 'mt-4 text-center font-semibold text-red-500';
+      if (err.name === 'AbortError') return;
+      setStatus(attendanceStatusDiv, 'error', 'Error checking status: ' + err.message);
     }
   });
 </script>
 </body>
 </html>
 """
+_INDEX_BODY = TEMPLATE_HTML.encode('utf-8')
+_INDEX_ETAG = hashlib.md5(_INDEX_BODY).hexdigest()
 
 if __name__ == '__main__':
+    with app.app_context():
+        init_db()
     app.run(debug=True)
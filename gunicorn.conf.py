@@ -0,0 +1,25 @@
+# Gunicorn settings for serving the app with gevent workers:
+#   gunicorn -c gunicorn.conf.py webtopy:app
+import os
+import subprocess
+import sys
+
+bind = os.environ.get('BIND', '0.0.0.0:8000')
+worker_class = 'gevent'
+workers = int(os.environ.get('WEB_CONCURRENCY', 4))
+worker_connections = 100
+# Hold idle browser connections open so repeated admin calls skip the handshake
+keepalive = 75
+
+
+def on_starting(server):
+    # Create the schema and run migrations once, in a separate process so the master
+    # doesn't import the app (and open database connections) before forking workers
+    subprocess.run([sys.executable, '-m', 'flask', '--app', server.app.app_uri, 'init-db'], check=True)
+
+
+def post_fork(server, worker):
+    # psycopg2 blocks the whole worker unless it is told to wait on gevent sockets
+    if os.environ.get('DATABASE_URL', '').startswith('postgresql'):
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()